@@ -2,12 +2,105 @@
 """
 Модуль для извлечения и валидации сырых данных
 """
-import gdown
+import hashlib
 import pandas as pd
 import os
+import shutil
+import subprocess
 from pathlib import Path
 
-def download_dataset(file_id: str = "1kk5pYKqE--lqhxEAfqsks3QVpK-LP-Ta", 
+def _payload_looks_like_html(output_path: Path) -> bool:
+    """
+    Проверяет, не является ли скачанный файл HTML-страницей
+
+    Для больших или помеченных файлов Google Drive отдает HTML-заглушку
+    с подтверждением вместо самого файла; aria2c скачивает ее «успешно».
+
+    Args:
+        output_path: путь к скачанному файлу
+
+    Returns:
+        bool: True если содержимое похоже на HTML, а не на данные
+    """
+    with open(output_path, 'rb') as f:
+        head = f.read(4096)
+    if not head:
+        return True
+    return head.lstrip().startswith(b'<') or b'<html' in head.lower()
+
+def _download_with_aria2c(url: str, output_path: Path) -> bool:
+    """
+    Пытается скачать файл через aria2c в несколько соединений
+
+    Параллельные соединения амортизируют сетевую задержку и дают
+    кратное ускорение на широких каналах. При отсутствии aria2c или
+    ошибке загрузки вызывающий код откатывается на gdown.
+
+    Args:
+        url: URL для скачивания
+        output_path: путь к выходному файлу
+
+    Returns:
+        bool: True если файл успешно скачан
+    """
+    if shutil.which('aria2c') is None:
+        return False
+
+    result = subprocess.run([
+        'aria2c', '-x', '8', '-s', '8', '--allow-overwrite=true',
+        '--dir', str(output_path.parent), '--out', output_path.name, url
+    ])
+    if result.returncode != 0 or not output_path.exists():
+        return False
+
+    # Код возврата 0 не гарантирует данные: Google Drive мог отдать
+    # HTML-заглушку — тогда удаляем ее и откатываемся на gdown,
+    # который умеет проходить страницу подтверждения
+    if _payload_looks_like_html(output_path):
+        output_path.unlink()
+        return False
+
+    return True
+
+def _file_digest(path: Path) -> str:
+    """
+    Считает хеш содержимого файла
+
+    Args:
+        path: путь к файлу
+
+    Returns:
+        str: blake2b-хеш содержимого
+    """
+    return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+
+def _is_cached(output_path: Path, url: str) -> bool:
+    """
+    Проверяет, есть ли проверенная локальная копия файла
+
+    Хеш успешной загрузки и ее URL сохраняются в sidecar-файл .etag;
+    повторная загрузка не нужна, только если содержимое не менялось
+    И файл был скачан именно с запрошенного URL.
+
+    Args:
+        output_path: путь к скачанному файлу
+        url: URL, с которого запрашивается файл
+
+    Returns:
+        bool: True если локальная копия валидна
+    """
+    etag_path = output_path.with_suffix(output_path.suffix + '.etag')
+    if not output_path.exists() or not etag_path.exists():
+        return False
+
+    parts = etag_path.read_text().strip().split(maxsplit=1)
+    if len(parts) != 2:
+        return False
+
+    cached_digest, cached_url = parts
+    return cached_url == url and cached_digest == _file_digest(output_path)
+
+def download_dataset(file_id: str = "1kk5pYKqE--lqhxEAfqsks3QVpK-LP-Ta",
                     output_file: str = "raw_dataset.csv") -> str:
     """
     Загружает dataset с Google Drive
@@ -27,12 +120,25 @@ def download_dataset(file_id: str = "1kk5pYKqE--lqhxEAfqsks3QVpK-LP-Ta",
     
     output_path = raw_dir / output_file
     
+    # Кеш: если проверенная копия именно этого URL уже на диске,
+    # сеть не трогаем
+    if _is_cached(output_path, url):
+        print(f"Используется кешированная копия {output_path}")
+        return str(output_path)
+
     print(f"Загрузка данных с {url}...")
-    gdown.download(url, str(output_path), quiet=False)
-    
+    if not _download_with_aria2c(url, output_path):
+        # Ленивый импорт: gdown нужен только при фактической загрузке
+        import gdown
+        gdown.download(url, str(output_path), quiet=False)
+
     if not output_path.exists():
         raise FileNotFoundError(f"Файл {output_path} не был загружен")
-    
+
+    # Фиксируем хеш и URL успешной загрузки для кеша следующих запусков
+    etag_path = output_path.with_suffix(output_path.suffix + '.etag')
+    etag_path.write_text(f"{_file_digest(output_path)} {url}")
+
     print(f"Данные сохранены в {output_path}")
     return str(output_path)
 
@@ -47,29 +153,36 @@ def validate_raw_data(file_path: str) -> bool:
         bool: True если данные валидны
     """
     try:
-        df = pd.read_csv(file_path)
-        
+        # Для проверки метаданных не нужен весь файл в памяти:
+        # читаем только заголовок и первые 5 строк
+        columns = pd.read_csv(file_path, nrows=0).columns
+        preview = pd.read_csv(file_path, nrows=5)
+
+        # Количество строк считаем потоково, без парсинга CSV
+        with open(file_path, 'rb') as f:
+            row_count = sum(1 for _ in f) - 1
+
         # Проверяем что файл не пустой
-        if df.empty:
+        if row_count <= 0:
             print("Ошибка: файл пустой")
             return False
-        
+
         # Проверяем минимальный набор колонок
-        expected_columns = ['Year_of_Release', 'NA_Sales', 'EU_Sales', 'JP_Sales', 
+        expected_columns = ['Year_of_Release', 'NA_Sales', 'EU_Sales', 'JP_Sales',
                            'Other_Sales', 'Global_Sales']
-        
-        missing_columns = [col for col in expected_columns if col not in df.columns]
+
+        missing_columns = [col for col in expected_columns if col not in columns]
         if missing_columns:
             print(f"Предупреждение: отсутствуют колонки: {missing_columns}")
-        
-        print(f"Сырые данные: {len(df)} строк, {len(df.columns)} колонок")
+
+        print(f"Сырые данные: {row_count} строк, {len(columns)} колонок")
         print("Первые 5 строк:")
-        print(df.head())
+        print(preview)
         print("\nТипы данных сырых данных:")
-        print(df.dtypes)
-        
+        print(preview.dtypes)
+
         return True
-        
+
     except Exception as e:
         print(f"Ошибка валидации сырых данных: {e}")
         return False
@@ -1,21 +1,35 @@
-# [file name]: etl/__init__.py
-"""
-Пакет ETL для обработки данных видеоигр
-"""
-
-__version__ = "1.0.0"
-__author__ = "Almas Rakhimkulov"
-
-from .extract import extract_data
-from .transform import transform_data
-from .load import load_data
-from .validate import comprehensive_validation
-from .main import run_etl_pipeline
-
-__all__ = [
-    'extract_data',
-    'transform_data', 
-    'load_data',
-    'comprehensive_validation',
-    'run_etl_pipeline'
-]
\ No newline at end of file
+# [file name]: etl/__init__.py
+"""
+Пакет ETL для обработки данных видеоигр
+"""
+import importlib
+
+__version__ = "1.0.0"
+__author__ = "Almas Rakhimkulov"
+
+# PEP 562: подмодули (и их тяжелые зависимости — pandas, SQLAlchemy,
+# gdown, pyarrow) импортируются только при первом обращении,
+# что ускоряет холодный старт CLI
+_LAZY_IMPORTS = {
+    'extract_data': 'extract',
+    'transform_data': 'transform',
+    'load_data': 'load',
+    'comprehensive_validation': 'validate',
+    'run_etl_pipeline': 'main',
+}
+
+__all__ = [
+    'extract_data',
+    'transform_data',
+    'load_data',
+    'comprehensive_validation',
+    'run_etl_pipeline'
+]
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        # Относительный импорт якорим на пакет etl (__package__),
+        # а не на сам модуль (__name__)
+        module = importlib.import_module(f'.{_LAZY_IMPORTS[name]}', __package__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
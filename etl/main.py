@@ -45,13 +45,12 @@ def run_etl_pipeline(file_id: str = None, table_name: str = "rakhimkulov",
         
         # Этап 2: Transform (Трансформация)
         print("\n2. ТРАНСФОРМАЦИЯ ДАННЫХ")
-        transformed_file = transform_data(raw_file)
-        transformed_data = pd.read_csv(transformed_file)
+        transformed_file, transformed_data = transform_data(raw_file)
         comprehensive_validation(transformed_data, 'transformed')
-        
+
         # Этап 3: Load (Загрузка)
         print("\n3. ЗАГРУЗКА ДАННЫХ")
-        success = load_data(transformed_file, table_name, max_rows)
+        success = load_data(transformed_data, table_name, max_rows)
         
         if success:
             print("\n" + "=" * 60)
@@ -32,13 +32,14 @@ def transform_data_types(df: pd.DataFrame) -> pd.DataFrame:
         "User_Count"
     ]
 
-    for col in numeric_columns:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+    # Один вызов вместо цикла по колонкам — меньше проходов по данным
+    present = [col for col in numeric_columns if col in df.columns]
+    df[present] = df[present].apply(pd.to_numeric, errors='coerce')
 
-    # Особое преобразование для Year_of_Release
+    # Особое преобразование для Year_of_Release: nullable Int64
+    # заполняет пропуски нулями за один проход без double-материализации
     if 'Year_of_Release' in df.columns:
-        df['Year_of_Release'] = pd.to_numeric(df['Year_of_Release'], errors='coerce').fillna(0).astype(int)
+        df['Year_of_Release'] = df['Year_of_Release'].astype('Int64').fillna(0)
 
     print("Типы после обработки:")
     print(df.dtypes)
@@ -55,23 +56,25 @@ def normalize_column_names(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame с нормализованными названиями колонок
     """
-    df.columns = [
-        col.strip().lower().replace(' ', '_') 
-        for col in df.columns
-    ]
+    # Векторизованные строковые операции Index вместо цикла по колонкам
+    df.columns = (
+        df.columns.str.strip()
+        .str.lower()
+        .str.replace(' ', '_', regex=False)
+    )
     print("Названия колонок нормализованы")
     return df
 
-def transform_data(input_file: str, output_file: str = "transformed_dataset.csv") -> str:
+def transform_data(input_file: str, output_file: str = "transformed_dataset.parquet") -> tuple:
     """
     Основная функция трансформации данных
-    
+
     Args:
         input_file: путь к входному CSV файлу
-        output_file: имя выходного файла
-        
+        output_file: имя выходного Parquet файла
+
     Returns:
-        str: путь к трансформированному файлу
+        tuple: (путь к трансформированному файлу, трансформированный DataFrame)
     """
     # Создаем директорию data/processed если не существует
     processed_dir = Path("data/processed")
@@ -79,16 +82,27 @@ def transform_data(input_file: str, output_file: str = "transformed_dataset.csv"
     
     output_path = processed_dir / output_file
     
-    # Чтение данных
-    df = pd.read_csv(input_file)
+    # Ленивый импорт: pyarrow нужен только на этапе трансформации
+    import pyarrow.csv as pa_csv
+
+    # Чтение данных многопоточным парсером pyarrow;
+    # strings_can_be_null сохраняет семантику pd.read_csv:
+    # пустые строковые поля — это NULL, а не ''
+    table = pa_csv.read_csv(
+        input_file,
+        read_options=pa_csv.ReadOptions(use_threads=True, block_size=8 << 20),
+        convert_options=pa_csv.ConvertOptions(strings_can_be_null=True)
+    )
+    df = table.to_pandas(self_destruct=True)
     print(f"Загружено {len(df)} строк для трансформации")
     
     # Трансформации
     df = transform_data_types(df)
     df = normalize_column_names(df)
     
-    # Сохранение
-    df.to_csv(output_path, index=False)
+    # Сохранение: Parquet вместо CSV — сохраняет типы колонок
+    # и избавляет load_data от повторного разбора CSV
+    df.to_parquet(output_path, index=False, compression='zstd', compression_level=3)
     print(f"Трансформированные данные сохранены в {output_path}")
-    
-    return str(output_path)
\ No newline at end of file
+
+    return str(output_path), df
\ No newline at end of file
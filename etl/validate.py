@@ -2,6 +2,7 @@
 """
 Модуль для валидации данных на разных этапах ETL
 """
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
@@ -39,25 +40,32 @@ def validate_data_quality(df: pd.DataFrame) -> bool:
         bool: True если качество данных приемлемое
     """
     issues = []
-    
-    # Проверка на пустые значения в ключевых колонках
-    key_columns = ['year_of_release', 'global_sales']
-    for col in key_columns:
-        if col in df.columns:
-            null_count = df[col].isnull().sum()
-            if null_count > 0:
-                issues.append(f"Колонка {col}: {null_count} пустых значений")
-    
-    # Проверка аномальных значений
-    if 'year_of_release' in df.columns:
-        invalid_years = df[df['year_of_release'] < 1950]['year_of_release'].count()
-        if invalid_years > 0:
-            issues.append(f"Найдено {invalid_years} записей с годом выпуска до 1950")
-    
-    if 'global_sales' in df.columns:
-        negative_sales = df[df['global_sales'] < 0]['global_sales'].count()
-        if negative_sales > 0:
-            issues.append(f"Найдено {negative_sales} записей с отрицательными продажами")
+
+    # Извлекаем колонки в numpy один раз и считаем все проверки
+    # редукциями по уже закешированным массивам — без промежуточных
+    # булевых масок и отфильтрованных Series
+    with np.errstate(invalid='ignore'):
+        if 'year_of_release' in df.columns:
+            year = df['year_of_release'].to_numpy(dtype='float64', na_value=np.nan)
+
+            null_years = int(np.isnan(year).sum())
+            if null_years > 0:
+                issues.append(f"Колонка year_of_release: {null_years} пустых значений")
+
+            invalid_years = int((year < 1950).sum())
+            if invalid_years > 0:
+                issues.append(f"Найдено {invalid_years} записей с годом выпуска до 1950")
+
+        if 'global_sales' in df.columns:
+            sales = df['global_sales'].to_numpy(dtype='float64', na_value=np.nan)
+
+            null_sales = int(np.isnan(sales).sum())
+            if null_sales > 0:
+                issues.append(f"Колонка global_sales: {null_sales} пустых значений")
+
+            negative_sales = int((sales < 0).sum())
+            if negative_sales > 0:
+                issues.append(f"Найдено {negative_sales} записей с отрицательными продажами")
     
     if issues:
         print("Предупреждения по качеству данных:")
@@ -77,7 +85,7 @@ def validate_output_files() -> bool:
     """
     files_to_check = [
         "data/raw/raw_dataset.csv",
-        "data/processed/transformed_dataset.csv", 
+        "data/processed/transformed_dataset.parquet",
         "data/processed/processed_data.parquet"
     ]
     